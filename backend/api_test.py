@@ -50,7 +50,29 @@ def test_run_warehouse():
     assert response.status_code == 200
     print(json.dumps(response.json(), indent=4))
 
+def test_whatif():
+    global warehouse
+
+    response = requests.post("http://localhost:8000/api/whatif", json={
+        "warehouse": warehouse,
+        "variants": [
+            { "name": "wall", "edits": [{ "position": [2, 2], "cell_type": "obstacle" }] },
+            { "name": "charger", "edits": [{ "position": [4, 4], "cell_type": "charging_station" }] }
+        ]
+    })
+    assert response.status_code == 200
+    assert len(response.json()["variants"]) == 2
+    print(json.dumps(response.json(), indent=4))
+
+def test_health():
+    response = requests.get("http://localhost:8000/api/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    print(json.dumps(response.json(), indent=4))
+
 if __name__ == "__main__":
+    test_health()
     test_create_warehouse()
     test_add_robot()
-    test_run_warehouse()
\ No newline at end of file
+    test_run_warehouse()
+    test_whatif()
\ No newline at end of file
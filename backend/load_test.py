@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from warehouse_system.enums import CellType, RobotType, Shift, TaskType
+
+# cell types an editing session paints onto the floor
+edit_cell_types = [CellType.EMPTY, CellType.OBSTACLE, CellType.RAMP, CellType.SLOPE, CellType.CHARGING_STATION]
+
+
+def parse_sizes(sizes: str) -> List[tuple]:
+    return [tuple(int(v) for v in size.lower().split("x")) for size in sizes.split(",")]
+
+
+def generate_tasks(warehouse: dict, count: int, rng: random.Random) -> List[dict]:
+    grid = warehouse["grid"]
+    free = [
+        (r, c) for r in range(grid["height"]) for c in range(grid["width"])
+        if grid["grid"][r][c] not in [CellType.OBSTACLE.value, CellType.ROBOT.value]
+    ]
+    if len(free) < 2:
+        return []
+    tasks = []
+    for i in range(count):
+        pickup, dropoff = rng.sample(free, 2)
+        tasks.append({
+            "task_id": f"T{i}",
+            "type": rng.choice(list(TaskType)).value,
+            "shift": Shift.DAY.value,
+            "pickup_location": list(pickup),
+            "dropoff_location": list(dropoff)
+        })
+    return tasks
+
+
+def empty_cells(warehouse: dict) -> List[tuple]:
+    grid = warehouse["grid"]
+    return [
+        (r, c) for r in range(grid["height"]) for c in range(grid["width"])
+        if grid["grid"][r][c] == CellType.EMPTY.value
+    ]
+
+
+def process_tree(pid: int) -> List[int]:
+    """A process and all its descendants (zone workers, what-if pools), from /proc."""
+    pids = [pid]
+    for parent in pids:
+        for task in glob.glob(f"/proc/{parent}/task/*/children"):
+            try:
+                with open(task) as f:
+                    pids.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+    return pids
+
+
+def read_rss(pid: Optional[int]) -> Dict:
+    """Resident memory in MB from /proc where available.
+
+    `rss_mb` and `peak_rss_mb` cover the process itself; `tree_rss_mb` adds
+    its child processes as they are right now.
+    """
+    empty = {"rss_mb": None, "peak_rss_mb": None, "tree_rss_mb": None, "processes": None}
+    if pid is None:
+        return empty
+    tree = []
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+            tree.append((int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024))
+        except (OSError, KeyError):
+            continue
+    if not tree:
+        return empty
+    return {
+        "rss_mb": tree[0][0],
+        "peak_rss_mb": tree[0][1],
+        "tree_rss_mb": sum(rss for rss, _ in tree),
+        "processes": len(tree)
+    }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, sizes: List[tuple], sessions: int, concurrency: int,
+                 edits_per_session: int, robots_per_session: int, tasks_per_run: int, runs_per_session: int,
+                 seed: int = 0):
+        self.client = client
+        self.sizes = sizes
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.edits_per_session = edits_per_session
+        self.robots_per_session = robots_per_session
+        self.tasks_per_run = tasks_per_run
+        self.runs_per_session = runs_per_session
+        self.seed = seed
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> Optional[dict]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, endpoint, **kwargs)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            return None
+        return response.json()
+
+    async def session(self, session_id: int):
+        """One planner: create a floor, edit it, place robots and schedule."""
+        rng = random.Random(self.seed * 100003 + session_id)
+        width, height = rng.choice(self.sizes)
+        data = await self.request("GET", "/api/init", params={"w": width, "h": height})
+        if data is None:
+            return
+        warehouse = data["warehouse"]
+
+        actions = ["cell"] * self.edits_per_session + ["robot"] * self.robots_per_session
+        rng.shuffle(actions)
+        for i, action in enumerate(actions):
+            if action == "cell":
+                body = {
+                    "warehouse": warehouse,
+                    "cell_params": {
+                        "position": [rng.randrange(height), rng.randrange(width)],
+                        "cell_type": rng.choice(edit_cell_types).value
+                    }
+                }
+                data = await self.request("POST", "/api/cell", json=body)
+            else:
+                cells = empty_cells(warehouse)
+                if not cells:
+                    continue
+                body = {
+                    "warehouse": warehouse,
+                    "robots_params": [{
+                        "robot_id": f"R{session_id}_{i}",
+                        "robot_type": rng.choice(list(RobotType)).value,
+                        "shift": rng.choice([Shift.DAY, Shift.TWENTY_FOUR_SEVEN]).value,
+                        "current_position": list(rng.choice(cells))
+                    }]
+                }
+                data = await self.request("POST", "/api/robot", json=body)
+            if data is not None:
+                warehouse = data["warehouse"]
+
+        for _ in range(self.runs_per_session):
+            warehouse["tasks"] = generate_tasks(warehouse, self.tasks_per_run, rng)
+            await self.request("POST", "/api/run", json={"warehouse": warehouse})
+
+    async def run(self) -> Dict:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(session_id: int):
+            async with semaphore:
+                await self.session(session_id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(i) for i in range(self.sessions)))
+        elapsed = time.perf_counter() - start
+
+        endpoints = {endpoint: self.summarize(samples, self.errors.get(endpoint, 0), elapsed)
+                     for endpoint, samples in sorted(self.latencies.items())}
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        return {
+            "elapsed_seconds": elapsed,
+            "total": self.summarize(all_samples, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints
+        }
+
+    @staticmethod
+    def summarize(samples: List[float], errors: int, elapsed: float) -> Dict:
+        if not samples:
+            return {"requests": 0, "errors": errors}
+        ms = np.array(samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {
+            "requests": len(samples),
+            "errors": errors,
+            "throughput_rps": len(samples) / elapsed,
+            "mean_ms": float(ms.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(ms.max())
+        }
+
+
+async def sample_memory(pid: Optional[int], samples: list, interval: float):
+    while True:
+        samples.append(read_rss(pid)["tree_rss_mb"])
+        await asyncio.sleep(interval)
+
+
+async def run_load_test(args, client: httpx.AsyncClient, server_pid: Optional[int], memory_scope: str) -> Dict:
+    test = LoadTest(client, parse_sizes(args.sizes), args.sessions, args.concurrency, args.edits,
+                    args.robots, args.tasks, args.runs, args.seed)
+    before = read_rss(server_pid)
+    samples = []
+    sampler = asyncio.create_task(sample_memory(server_pid, samples, 0.25))
+    try:
+        report = await test.run()
+    finally:
+        sampler.cancel()
+    after = read_rss(server_pid)
+    samples = [s for s in samples if s is not None]
+
+    report["memory"] = {
+        "scope": memory_scope,
+        "pid": server_pid,
+        "rss_start_mb": before["rss_mb"],
+        "rss_end_mb": after["rss_mb"],
+        "peak_rss_mb": after["peak_rss_mb"],
+        "tree_rss_start_mb": before["tree_rss_mb"],
+        "tree_rss_end_mb": after["tree_rss_mb"],
+        "tree_rss_max_sampled_mb": max(samples) if samples else None,
+        "processes_end": after["processes"]
+    }
+    report["config"] = {key: value for key, value in vars(args).items() if key != "output"}
+    return report
+
+
+def launch_server(port: int) -> subprocess.Popen:
+    backend = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=backend
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            httpx.get(f"{url}/api/init", timeout=1)
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Server did not start in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay editing and scheduling sessions against the warehouse API.",
+        epilog="Memory covers the server process and its children (zone workers, what-if pools). In-process runs "
+               "measure the harness and the app together; --launch isolates the server; --url reports none."
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Existing server to load, e.g. http://localhost:8000 (memory is not reported)")
+    target.add_argument("--launch", action="store_true", help="Start a local uvicorn server for the run")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --launch")
+    parser.add_argument("--sizes", default="10x10,25x25,50x50", help="Comma-separated WxH floor sizes to sample")
+    parser.add_argument("--sessions", type=int, default=20, help="Number of editing sessions")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sessions running at once")
+    parser.add_argument("--edits", type=int, default=20, help="/api/cell calls per session")
+    parser.add_argument("--robots", type=int, default=5, help="/api/robot calls per session")
+    parser.add_argument("--tasks", type=int, default=5, help="Tasks per /api/run")
+    parser.add_argument("--runs", type=int, default=1, help="/api/run calls per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    server = None
+    app = None
+    if args.launch:
+        server = launch_server(args.port)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=None)
+        pid = server.pid
+        memory_scope = "server"
+    elif args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+        pid = None
+        memory_scope = "none"
+    else:
+        from main import app
+        # report app errors as 500s like a real server instead of aborting the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=None)
+        pid = os.getpid()
+        memory_scope = "harness+app"
+
+    async def run():
+        async with client:
+            if app is None:
+                return await run_load_test(args, client, pid, memory_scope)
+            # ASGITransport skips lifespan events, so run startup/shutdown around the test
+            async with app.router.lifespan_context(app):
+                return await run_load_test(args, client, pid, memory_scope)
+
+    try:
+        report = asyncio.run(run())
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,54 @@
-from typing import Dict, List, Any, Optional
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Tuple
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from warehouse_system.warehouse import Warehouse
+from warehouse_system.zones import ZonePool, ZonedWarehouse
+from warehouse_system.what_if import evaluate_layout_changes
+from warehouse_system.schedule import is_solver_loaded
+from warehouse_system.startup import warm_up
 from warehouse_system.grid import Grid, CellType
 from warehouse_system.robot import Robot
 from warehouse_system.enums import RobotType, Shift
 from pydantic import BaseModel
 
-app = FastAPI()
+# Zoned mode: WAREHOUSE_ZONES="2x2" splits /api/run across WAREHOUSE_ZONE_WORKERS processes
+ZONES = os.environ.get("WAREHOUSE_ZONES")
+ZONE_WORKERS = int(os.environ.get("WAREHOUSE_ZONE_WORKERS", "0")) or None
+zone_pool: Optional[ZonePool] = None
+zone_layout: Optional[Tuple[int, int]] = None
+
+# Warm-up: WAREHOUSE_WARMUP=1 preloads the solver before serving
+WARMUP = os.environ.get("WAREHOUSE_WARMUP", "0") not in ["", "0"]
+warmup_stats: Optional[Dict[str, Any]] = None
+
+def parse_zone_layout(value: str) -> Tuple[int, int]:
+    try:
+        zone_rows, zone_cols = map(int, value.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"WAREHOUSE_ZONES must look like 2x2, got {value!r}")
+    if zone_rows < 1 or zone_cols < 1:
+        raise ValueError(f"WAREHOUSE_ZONES needs at least one zone row and column, got {value!r}")
+    return zone_rows, zone_cols
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global zone_pool, zone_layout, warmup_stats
+    if ZONES:
+        zone_layout = parse_zone_layout(ZONES)
+        zone_pool = ZonePool(ZONE_WORKERS)
+    if WARMUP:
+        warmup_stats = warm_up()
+        if zone_pool:
+            zone_pool.warm_up()
+    yield
+    if zone_pool:
+        zone_pool.close()
+        zone_pool = None
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +85,23 @@ class WarehouseRequest(BaseModel):
     robots_params: Optional[List[Robot_Params]] = None
     cell_params: Optional[Cell_Params] = None
 
+class Variant_Params(BaseModel):
+    name: Optional[str] = None
+    edits: List[Cell_Params]
+
+class WhatIfRequest(BaseModel):
+    warehouse: WarehouseBody
+    variants: List[Variant_Params]
+
+@app.get("/api/health")
+def health():
+    return {
+        "status": "ok",
+        "solver_loaded": is_solver_loaded(),
+        "zoned": zone_pool is not None,
+        "warmup": warmup_stats
+    }
+
 @app.get("/api/init")
 def init_grid(w: int = 5, h: int = 5):
     warehouse = Warehouse(Grid(w, h))
@@ -107,6 +164,9 @@ def set_cell(request: WarehouseRequest):
 
 @app.post("/api/run")
 def run_scheduler(request: WarehouseRequest):
+    if zone_pool:
+        return run_zoned_scheduler(request)
+
     try:
         warehouse = Warehouse.deserialize(request.warehouse.model_dump())
     except Exception as e:
@@ -116,3 +176,28 @@ def run_scheduler(request: WarehouseRequest):
         "warehouse": warehouse.serialize(),
         "scheduler": warehouse.get_scheduler().serialize()
     }
+
+def run_zoned_scheduler(request: WarehouseRequest):
+    zone_rows, zone_cols = zone_layout
+    try:
+        warehouse = ZonedWarehouse.deserialize(request.warehouse.model_dump(), zone_pool, zone_rows, zone_cols)
+    except Exception as e:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error": str(e)})
+
+    return {
+        "warehouse": warehouse.serialize(),
+        "scheduler": warehouse.get_scheduler().serialize()
+    }
+
+@app.post("/api/whatif")
+def what_if(request: WhatIfRequest):
+    if not request.variants:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error": "No variants to evaluate"})
+
+    try:
+        return evaluate_layout_changes(
+            request.warehouse.model_dump(),
+            [variant.model_dump() for variant in request.variants]
+        )
+    except Exception as e:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error": str(e)})
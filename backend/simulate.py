@@ -3,6 +3,8 @@ from warehouse_system.grid import Grid, CellType
 from warehouse_system.robot import Robot
 from warehouse_system.task import Task
 from warehouse_system.enums import RobotType, Shift, TaskType
+from warehouse_system.simulation import ExecutionSimulator, generate_arrivals, greedy_hook
+from warehouse_system.zones import ZonePool, ZonedWarehouse
 
 def simulate_basic_direct():
     grid = Grid(5, 5)
@@ -81,6 +83,86 @@ def simulate_type_or_shift_mismatch():
     assignments = scheduler.compute_global_optimal_schedule()
     scheduler.print_schedule(assignments)
 
+def simulate_shift_execution():
+    grid = Grid(8, 8)
+    grid.set_cell(0, 0, CellType.CHARGING_STATION)
+
+    robots = [
+        Robot('R1', RobotType.GENERAL, Shift.DAY, current_position=(7, 7)),
+        Robot('R2', RobotType.STANDARD, Shift.DAY, battery_level=40, current_position=(3, 3))
+    ]
+
+    simulator = ExecutionSimulator(grid, robots, seconds_per_cell=2, recharge_below=30, battery_reserve=15)
+    simulator.add_arrivals(generate_arrivals(grid, 60, 8 * 3600, seed=0, task_types=[TaskType.STANDARD, TaskType.HEAVY]))
+    stats = simulator.run(8 * 3600)
+    print(f"  Completed: {stats['tasks_completed']} ({stats['throughput_per_hour']:.1f}/h), pending: {stats['tasks_pending']}")
+    print(f"  Latency p50/p95: {stats['latency_seconds']['p50']:.0f}s / {stats['latency_seconds']['p95']:.0f}s")
+    print(f"  Utilisation: {stats['robot_utilisation']['mean']:.2f}, charges: {stats['battery']['charges']}")
+
+def simulate_large_floor_shift():
+    grid = Grid(60, 60)
+    for r in range(0, 60, 10):
+        for c in range(0, 60, 10):
+            grid.set_cell(r, c, CellType.CHARGING_STATION)
+
+    robots = [
+        Robot(f'R{i}', RobotType.GENERAL, Shift.TWENTY_FOUR_SEVEN, current_position=(i // 60, i % 60))
+        for i in range(60, 1060)
+    ]
+
+    simulator = ExecutionSimulator(grid, robots, reschedule=greedy_hook, reschedule_interval=30,
+                                   charge_seconds=300, recharge_below=40, battery_reserve=20)
+    simulator.add_arrivals(generate_arrivals(grid, 4000, 24 * 3600, seed=0, max_distance=25))
+    stats = simulator.run(24 * 3600)
+    print(f"  Completed: {stats['tasks_completed']} ({stats['throughput_per_hour']:.1f}/h), pending: {stats['tasks_pending']}")
+    print(f"  Latency p50/p95/p99: {stats['latency_seconds']['p50']:.0f}s / {stats['latency_seconds']['p95']:.0f}s / {stats['latency_seconds']['p99']:.0f}s")
+    print(f"  Utilisation: {stats['robot_utilisation']['mean']:.2f}, mean battery: {stats['battery']['mean_level']:.1f}")
+
+def simulate_zoned_cross_zone():
+    grid = Grid(8, 4)
+    robots = [
+        Robot('R1', RobotType.GENERAL, Shift.DAY, current_position=(0, 0)),
+        Robot('R2', RobotType.GENERAL, Shift.DAY, current_position=(3, 7))
+    ]
+    tasks = [
+        Task('1', TaskType.STANDARD, Shift.DAY, (1, 1), (2, 6)),
+        Task('2', TaskType.STANDARD, Shift.DAY, (1, 2), (9, 9))
+    ]
+
+    pool = ZonePool(2)
+    try:
+        warehouse = ZonedWarehouse(grid, [], [], pool, zone_rows=1, zone_cols=2)
+        for robot in robots:
+            warehouse.add_robot(robot)
+        for task in tasks:
+            warehouse.add_task(task)
+        assignments = warehouse.compute_schedule()
+
+        assert set(assignments) == {'1:0', '1:1'}, "off-floor task 2 should be skipped"
+        first, second = assignments['1:0'], assignments['1:1']
+        exit_cell, entry_cell = first['handoff']['exit'], first['handoff']['entry']
+        assert abs(exit_cell[0] - entry_cell[0]) + abs(exit_cell[1] - entry_cell[1]) == 1
+        assert exit_cell[1] == 3 and entry_cell[1] == 4
+        assert list(first['path_to_dropoff'][-1]) == exit_cell
+        assert list(second['path_to_pickup'][-1]) == entry_cell
+        assert second['handoff'] is None
+        print(f"  Leg 0: {first['robot_id']} drops at {exit_cell}; transfer to {entry_cell}; leg 1: {second['robot_id']}")
+
+        # an unchanged layout is served from the workers' cache, even from a new instance
+        again = ZonedWarehouse.deserialize(warehouse.serialize(), pool, zone_rows=1, zone_cols=2).compute_schedule()
+        assert again == assignments
+
+        # a cross-zone task with no robot for its second leg must not cost the in-zone task its robot
+        stranded = ZonedWarehouse(Grid(8, 4), [], [], pool, zone_rows=1, zone_cols=2)
+        stranded.add_robot(Robot('R1', RobotType.GENERAL, Shift.DAY, current_position=(0, 0)))
+        stranded.add_task(Task('X', TaskType.STANDARD, Shift.DAY, (3, 0), (3, 3)))
+        stranded.add_task(Task('Y', TaskType.STANDARD, Shift.DAY, (0, 1), (0, 6)))
+        assignments = stranded.compute_schedule()
+        assert {task_id: info['robot_id'] for task_id, info in assignments.items()} == {'X': 'R1'}
+        print(f"  Stranded cross-zone task dropped, in-zone task kept: {sorted(assignments)}")
+    finally:
+        pool.close()
+
 def test_deserialize():
     grid = Grid(5, 5)
     grid.set_cell(0, 0, CellType.OBSTACLE)
@@ -107,6 +189,15 @@ def run_all_tests():
     print("\n========== TEST: Type/Shift Incompatibility ==========")
     simulate_type_or_shift_mismatch()
 
+    print("\n========== TEST: Shift Execution ==========")
+    simulate_shift_execution()
+
+    print("\n========== TEST: Large Floor 24h Shift ==========")
+    simulate_large_floor_shift()
+
+    print("\n========== TEST: Zoned Cross-Zone Task ==========")
+    simulate_zoned_cross_zone()
+
     print("\n========== TEST: Serialization/Deserialization ==========")
     test_deserialize()
 
@@ -1,10 +1,31 @@
-from ortools.sat.python import cp_model
+import importlib
+import threading
+import time
 from warehouse_system.grid import Grid
 from warehouse_system.path_finder import PathFinder
 from warehouse_system.task import Task
 from warehouse_system.robot import Robot
 from warehouse_system.enums import RobotType, TaskType, Shift, CellType
 
+# OR-Tools is imported on the first solve: most requests never schedule and its import dominates startup
+_cp_model = None
+_cp_model_lock = threading.Lock()
+solver_load_seconds = None
+
+def load_cp_model():
+    global _cp_model, solver_load_seconds
+    if _cp_model is None:
+        with _cp_model_lock:
+            if _cp_model is None:
+                start = time.perf_counter()
+                module = importlib.import_module("ortools.sat.python.cp_model")
+                solver_load_seconds = time.perf_counter() - start
+                _cp_model = module
+    return _cp_model
+
+def is_solver_loaded() -> bool:
+    return _cp_model is not None
+
 class Scheduler:
     def __init__(self, grid: Grid, tasks: list[Task], robots: list[Robot]):
         self.grid = grid
@@ -25,10 +46,75 @@ class Scheduler:
     def is_shift_compatible(robot_shift: Shift, task_shift: Shift):
         return robot_shift == Shift.TWENTY_FOUR_SEVEN or robot_shift == task_shift
 
-    def compute_global_optimal_schedule(self):
-        model = cp_model.CpModel()
+    def compute_pair_cost(self, pathfinder: PathFinder, task: Task, robot: Robot, charging_stations: list):
+        """Battery cost and paths for one robot doing one task, or None if it cannot."""
+        pickup = self.task_locations[task.task_id]['pickup']
+        dropoff = self.task_locations[task.task_id]['dropoff']
+
+        original_pos = robot.current_position
+        original_cell = self.grid.get_cell(original_pos[0], original_pos[1])
+        original_battery_level = robot.battery_level
+        pair = None
+
+        self.grid.set_cell(original_pos[0], original_pos[1], CellType.EMPTY)
+        robot.is_carrying_box = False
+        path1 = pathfinder.find_path(robot, pickup)
+        cost1 = pathfinder.compute_battery_cost(path1, False)
+
+        robot.current_position = pickup
+        robot.is_carrying_box = True
+        path2 = pathfinder.find_path(robot, dropoff)
+        cost2 = pathfinder.compute_battery_cost(path2, True)
+        self.grid.set_cell(original_pos[0], original_pos[1], original_cell)
+
+        total_cost = cost1 + cost2
+        if total_cost <= robot.battery_level:
+            pair = {'cost': total_cost, 'path_to_pickup': path1, 'path_to_dropoff': path2, 'path_to_charge': None}
+        else:
+            for station in charging_stations:
+                robot.is_carrying_box = False
+                robot.current_position = original_pos
+                path_to_charge = pathfinder.find_path(robot, station)
+                charge_cost = pathfinder.compute_battery_cost(path_to_charge, False)
+
+                if charge_cost <= original_battery_level:
+                    robot.charge()
+                    robot.current_position = station
+
+                    robot.is_carrying_box = False
+                    path1 = pathfinder.find_path(robot, pickup)
+                    cost1 = pathfinder.compute_battery_cost(path1, False)
+
+                    robot.current_position = pickup
+                    robot.is_carrying_box = True
+                    path2 = pathfinder.find_path(robot, dropoff)
+                    cost2 = pathfinder.compute_battery_cost(path2, True)
 
+                    total_cost = cost1 + cost2
+                    if total_cost <= robot.battery_level:
+                        pair = {'cost': total_cost, 'path_to_pickup': path1, 'path_to_dropoff': path2, 'path_to_charge': path_to_charge}
+                    break
+
+        robot.current_position = original_pos
+        robot.battery_level = original_battery_level
+        return pair
+
+    def compute_pair_costs(self):
+        """Precompute costs and paths for every compatible (task index, robot index) pair."""
         pathfinder = PathFinder(self.grid)
+        charging_stations = self.grid.find_charging_stations()
+
+        pair_costs = {}
+        for i, task in enumerate(self.tasks):
+            for j, robot in enumerate(self.robots):
+                if not (self.is_type_compatible(robot.robot_type, task.type) and self.is_shift_compatible(robot.shift, task.shift)):
+                    continue
+                pair_costs[(i, j)] = self.compute_pair_cost(pathfinder, task, robot, charging_stations)
+        return pair_costs
+
+    def solve(self, pair_costs: dict):
+        cp_model = load_cp_model()
+        model = cp_model.CpModel()
 
         num_tasks = len(self.tasks)
         num_robots = len(self.robots)
@@ -50,83 +136,14 @@ class Scheduler:
         for j in range(num_robots):
             model.Add(sum(assignment[i][j] for i in range(num_tasks)) <= 1)
 
-        # Precompute all path costs and paths
-        cost_matrix = [[float('inf')] * num_robots for _ in range(num_tasks)]
-        path_matrix = [[None] * num_robots for _ in range(num_tasks)]
-        drop_matrix = [[None] * num_robots for _ in range(num_tasks)]
-        charge_matrix = [[None] * num_robots for _ in range(num_tasks)]
-        valid_pairs = set()
-        
-        charging_stations = self.grid.find_charging_stations()
-
-        for i, task in enumerate(self.tasks):
-            pickup = self.task_locations[task.task_id]['pickup']
-            dropoff = self.task_locations[task.task_id]['dropoff']
-
-            for j, robot in enumerate(self.robots):
-                if not (self.is_type_compatible(robot.robot_type, task.type) and self.is_shift_compatible(robot.shift, task.shift)):
-                    continue
-
-                original_pos = robot.current_position
-                original_battery_level = robot.battery_level
-
-                self.grid.set_cell(original_pos[0], original_pos[1], CellType.EMPTY)
-                robot.is_carrying_box = False
-                path1 = pathfinder.find_path(robot, pickup)
-                cost1 = pathfinder.compute_battery_cost(path1, False)
-
-                robot.current_position = pickup
-                robot.is_carrying_box = True
-                path2 = pathfinder.find_path(robot, dropoff)
-                cost2 = pathfinder.compute_battery_cost(path2, True)
-                self.grid.set_cell(original_pos[0], original_pos[1], CellType.ROBOT)
-
-                total_cost = cost1 + cost2
-                print(robot.robot_id, task.task_id, total_cost, robot.battery_level)
-                if total_cost <= robot.battery_level:
-                    cost_matrix[i][j] = total_cost
-                    path_matrix[i][j] = path1
-                    drop_matrix[i][j] = path2
-                    charge_matrix[i][j] = None
-                    valid_pairs.add((i, j))
-                else:
-                    for station in charging_stations:
-                        robot.is_carrying_box = False
-                        robot.current_position = original_pos
-                        path_to_charge = pathfinder.find_path(robot, station)
-                        charge_cost = pathfinder.compute_battery_cost(path_to_charge, False)
-
-                        if charge_cost <= original_battery_level:
-                            robot.charge()
-                            robot.current_position = station
-
-                            robot.is_carrying_box = False
-                            path1 = pathfinder.find_path(robot, pickup)
-                            cost1 = pathfinder.compute_battery_cost(path1, False)
-
-                            robot.current_position = pickup
-                            robot.is_carrying_box = True
-                            path2 = pathfinder.find_path(robot, dropoff)
-                            cost2 = pathfinder.compute_battery_cost(path2, True)
-
-                            total_cost = cost1 + cost2
-                            if total_cost <= robot.battery_level:
-                                cost_matrix[i][j] = total_cost
-                                path_matrix[i][j] = path1
-                                drop_matrix[i][j] = path2
-                                charge_matrix[i][j] = path_to_charge
-                                valid_pairs.add((i, j))
-                            break
-
-                robot.current_position = original_pos
-                robot.battery_level = original_battery_level
+        valid_pairs = {pair for pair, cost in pair_costs.items() if cost is not None}
 
         # Objective: minimize total battery cost
         total_cost_expr = []
         for i in range(num_tasks):
             for j in range(num_robots):
                 if (i, j) in valid_pairs:
-                    total_cost_expr.append(cost_matrix[i][j] * assignment[i][j])
+                    total_cost_expr.append(pair_costs[(i, j)]['cost'] * assignment[i][j])
 
         assigned = [
             assignment[i][j]
@@ -149,15 +166,19 @@ class Scheduler:
             for i, task in enumerate(self.tasks):
                 for j, robot in enumerate(self.robots):
                     if (i, j) in valid_pairs and solver.Value(assignment[i][j]) == 1:
+                        pair = pair_costs[(i, j)]
                         result[task.task_id] = {
                             'robot_id': robot.robot_id,
-                            'estimated_battery_cost': cost_matrix[i][j],
-                            'path_to_pickup': path_matrix[i][j],
-                            'path_to_dropoff': drop_matrix[i][j],
-                            'path_to_charge': charge_matrix[i][j]
+                            'estimated_battery_cost': pair['cost'],
+                            'path_to_pickup': pair['path_to_pickup'],
+                            'path_to_dropoff': pair['path_to_dropoff'],
+                            'path_to_charge': pair['path_to_charge']
                         }
         return result
 
+    def compute_global_optimal_schedule(self):
+        return self.solve(self.compute_pair_costs())
+
     def serialize(self):
         return self.compute_global_optimal_schedule()
 
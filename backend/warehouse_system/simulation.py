@@ -0,0 +1,393 @@
+import copy
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from warehouse_system.grid import Grid
+from warehouse_system.robot import Robot
+from warehouse_system.task import Task
+from warehouse_system.schedule import Scheduler
+from warehouse_system.enums import RobotType, TaskType, Shift, CellType
+
+SECONDS_PER_HOUR = 3600.0
+
+# A reschedule hook receives the idle robots and the pending tasks and returns
+# a schedule in the same format as Scheduler.compute_global_optimal_schedule().
+# It is also passed the simulator's battery_reserve as a keyword argument.
+RescheduleHook = Callable[..., Dict]
+
+_robot_type_codes = {robot_type: i for i, robot_type in enumerate(RobotType)}
+_task_type_codes = {task_type: i for i, task_type in enumerate(TaskType)}
+_shift_codes = {shift: i for i, shift in enumerate(Shift)}
+
+# type_compatible[robot_type_code, task_type_code], mirrors Scheduler.is_type_compatible
+_type_compatible = np.array([
+    [bool(Scheduler.is_type_compatible(robot_type, task_type)) for task_type in TaskType]
+    for robot_type in RobotType
+])
+# shift_compatible[robot_shift_code, task_shift_code], mirrors Scheduler.is_shift_compatible
+_shift_compatible = np.array([
+    [Scheduler.is_shift_compatible(robot_shift, task_shift) for task_shift in Shift]
+    for robot_shift in Shift
+])
+
+
+def _manhattan(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise Manhattan distances between (n, 2) and (m, 2) position arrays."""
+    return np.abs(a[:, None, 0] - b[None, :, 0]) + np.abs(a[:, None, 1] - b[None, :, 1])
+
+
+def scheduler_hook(grid: Grid, robots: List[Robot], tasks: List[Task], battery_reserve: float = 0.0) -> Dict:
+    """Reschedule with the CP-SAT Scheduler, exactly as /api/run does.
+
+    Robots arrive with the reserve already taken off their battery level; the
+    Scheduler always plans charging detours from a full 100, so the reserve is
+    not applied after a charge.
+    """
+    return Scheduler(grid, tasks, robots).compute_global_optimal_schedule()
+
+
+def greedy_hook(grid: Grid, robots: List[Robot], tasks: List[Task], battery_reserve: float = 0.0) -> Dict:
+    """Vectorised nearest-robot dispatch for floors too large to solve with CP-SAT on every event.
+
+    Distances are Manhattan, so obstacles are ignored; battery costs follow
+    PathFinder.compute_battery_cost for an unobstructed path.
+    """
+    if not robots or not tasks:
+        return {}
+
+    robot_pos = np.array([r.current_position for r in robots], dtype=np.int64)
+    battery = np.array([r.battery_level for r in robots], dtype=np.float64)
+    robot_types = np.array([_robot_type_codes[r.robot_type] for r in robots])
+    robot_shifts = np.array([_shift_codes[r.shift] for r in robots])
+
+    stations = np.array(grid.find_charging_stations(), dtype=np.int64).reshape(-1, 2)
+    if len(stations):
+        robot_to_station = _manhattan(robot_pos, stations)
+        nearest_station = robot_to_station.argmin(axis=1)
+        charge_cells = robot_to_station[np.arange(len(robots)), nearest_station]
+        station_pos = stations[nearest_station]
+        can_reach_station = charge_cells + 1 <= battery
+
+    result = {}
+    free = np.ones(len(robots), dtype=bool)
+    # bound the [task, robot] matrices to a few million cells per chunk
+    chunk = max(1, (1 << 22) // len(robots))
+    for start in range(0, len(tasks), chunk):
+        if not free.any():
+            break
+        batch = tasks[start:start + chunk]
+        pickups = np.array([t.pickup_location for t in batch], dtype=np.int64)
+        dropoffs = np.array([t.dropoff_location for t in batch], dtype=np.int64)
+        task_types = np.array([_task_type_codes[t.type] for t in batch])
+        task_shifts = np.array([_shift_codes[t.shift] for t in batch])
+
+        compatible = _type_compatible[robot_types[None, :], task_types[:, None]] & \
+            _shift_compatible[robot_shifts[None, :], task_shifts[:, None]]
+        to_pickup = _manhattan(pickups, robot_pos)
+        to_dropoff = np.abs(dropoffs - pickups).sum(axis=1)
+        carry_cost = 2 * (to_dropoff + 1)
+        direct_cost = to_pickup + 1 + carry_cost[:, None]
+        direct_ok = direct_cost <= battery[None, :]
+
+        if len(stations):
+            station_to_pickup = _manhattan(pickups, station_pos)
+            charged_cost = station_to_pickup + 1 + carry_cost[:, None]
+            charge_ok = ~direct_ok & can_reach_station[None, :] & (charged_cost <= 100 - battery_reserve)
+        else:
+            charged_cost = direct_cost
+            charge_ok = np.zeros_like(direct_ok)
+
+        cost = np.where(direct_ok, direct_cost, charged_cost).astype(np.float64)
+        cost[~(compatible & (direct_ok | charge_ok))] = np.inf
+
+        for i in np.flatnonzero(np.isfinite(cost).any(axis=1)).tolist():
+            task = batch[i]
+            row = np.where(free, cost[i], np.inf)
+            j = int(row.argmin())
+            if not np.isfinite(row[j]):
+                continue
+            free[j] = False
+            charging = bool(charge_ok[i, j])
+            travel = to_dropoff[i] + (charge_cells[j] + station_to_pickup[i, j] if charging else to_pickup[i, j])
+            result[task.task_id] = {
+                'robot_id': robots[j].robot_id,
+                'estimated_battery_cost': int(cost[i, j]),
+                'path_to_pickup': None,
+                'path_to_dropoff': None,
+                'path_to_charge': None,
+                'charge_station': tuple(int(v) for v in station_pos[j]) if charging else None,
+                'travel_cells': int(travel)
+            }
+            if not free.any():
+                break
+    return result
+
+
+def generate_arrivals(grid: Grid, tasks_per_hour: float, duration: float, seed: Optional[int] = None,
+                      task_types: Optional[List[TaskType]] = None, shifts: Optional[List[Shift]] = None,
+                      max_distance: Optional[int] = None) -> List[Tuple[float, Task]]:
+    """Poisson task arrivals over `duration` seconds with pickups/dropoffs on free cells.
+
+    `max_distance` bounds the Manhattan distance between pickup and dropoff, so
+    every task fits in a single battery charge on large floors.
+    """
+    rng = np.random.default_rng(seed)
+    task_types = task_types or list(TaskType)
+    shifts = shifts or [Shift.DAY]
+
+    free_cells = np.array([
+        (r, c) for r in range(grid.height) for c in range(grid.width)
+        if grid.get_cell(r, c) not in [CellType.OBSTACLE, CellType.ROBOT]
+    ], dtype=np.int64).reshape(-1, 2)
+    if len(free_cells) < 2 or tasks_per_hour <= 0:
+        return []
+
+    count = rng.poisson(tasks_per_hour * duration / SECONDS_PER_HOUR)
+    times = np.sort(rng.uniform(0, duration, count))
+    pickups = free_cells[rng.integers(0, len(free_cells), count)]
+    dropoffs = free_cells[rng.integers(0, len(free_cells), count)]
+    type_idx = rng.integers(0, len(task_types), count)
+    shift_idx = rng.integers(0, len(shifts), count)
+    if max_distance is not None:
+        too_far = np.abs(dropoffs - pickups).sum(axis=1) > max_distance
+        for _ in range(100):
+            if not too_far.any():
+                break
+            dropoffs[too_far] = free_cells[rng.integers(0, len(free_cells), int(too_far.sum()))]
+            too_far = np.abs(dropoffs - pickups).sum(axis=1) > max_distance
+        # give up on pickups with no free cell in range
+        keep = ~too_far
+        times, pickups, dropoffs = times[keep], pickups[keep], dropoffs[keep]
+        type_idx, shift_idx = type_idx[keep], shift_idx[keep]
+
+    pickups, dropoffs = pickups.tolist(), dropoffs.tolist()
+    return [
+        (time, Task(f"T{i}", task_types[t], shifts[s], tuple(pickups[i]), tuple(dropoffs[i])))
+        for i, (time, t, s) in enumerate(zip(times.tolist(), type_idx.tolist(), shift_idx.tolist()))
+    ]
+
+
+class ExecutionSimulator:
+    """Discrete-event execution of schedules over a shift.
+
+    Robot state lives in NumPy arrays indexed like `robots`. Time jumps from
+    event to event (task arrival, robot becoming idle, reschedule window), so
+    long shifts cost time proportional to the number of events, not ticks.
+    """
+
+    def __init__(self, grid: Grid, robots: List[Robot], reschedule: RescheduleHook = scheduler_hook,
+                 seconds_per_cell: float = 1.0, charge_seconds: float = 0.0, reschedule_interval: float = 0.0,
+                 recharge_below: Optional[float] = None, battery_reserve: float = 0.0,
+                 on_dispatch: Optional[Callable[[float, Dict], None]] = None):
+        self.grid = copy.deepcopy(grid)
+        self.robots = [copy.copy(r) for r in robots]
+        self.reschedule = reschedule
+        self.seconds_per_cell = seconds_per_cell
+        self.charge_seconds = charge_seconds
+        self.reschedule_interval = reschedule_interval
+        self.recharge_below = recharge_below
+        self.battery_reserve = battery_reserve
+        self.on_dispatch = on_dispatch
+
+        n = len(self.robots)
+        self.robot_index = {r.robot_id: j for j, r in enumerate(self.robots)}
+        self.position = np.array([r.current_position for r in self.robots], dtype=np.int64).reshape(n, 2)
+        self.battery = np.array([r.battery_level for r in self.robots], dtype=np.float64)
+        self.busy_until = np.zeros(n, dtype=np.float64)
+        self.busy_seconds = np.zeros(n, dtype=np.float64)
+        self.charges = np.zeros(n, dtype=np.int64)
+        self.battery_used = np.zeros(n, dtype=np.float64)
+
+        self.stations = np.array(self.grid.find_charging_stations(), dtype=np.int64).reshape(-1, 2)
+        for r, c in self.position.tolist():
+            if self.grid.get_cell(r, c) == CellType.EMPTY:
+                self.grid.set_cell(r, c, CellType.ROBOT)
+
+        self.time = 0.0
+        self.pending: List[Tuple[float, Task]] = []
+        self.arrivals: List[Tuple[float, int, Task]] = []
+        self.completions: List[Tuple[float, float, float]] = []  # (arrival, dispatch, completion)
+        self.reschedule_calls = 0
+        self._arrival_seq = 0
+
+    def add_arrivals(self, arrivals: List[Tuple[float, Task]]):
+        start = self._arrival_seq
+        self.arrivals.extend((arrival_time, start + i, task) for i, (arrival_time, task) in enumerate(arrivals))
+        self._arrival_seq += len(arrivals)
+        heapq.heapify(self.arrivals)
+
+    def load_schedule(self, schedule: Dict, tasks: List[Task]):
+        """Start executing a precomputed Scheduler output at the current time."""
+        by_id = {task.task_id: task for task in tasks}
+        self._apply(schedule, [(self.time, by_id[task_id]) for task_id in schedule])
+        assigned = set(schedule)
+        self.pending.extend((self.time, task) for task in tasks if task.task_id not in assigned)
+
+    def _idle_mask(self) -> np.ndarray:
+        return self.busy_until <= self.time
+
+    def _sync_robots(self, indices: np.ndarray) -> List[Robot]:
+        robots = []
+        for j in indices:
+            robot = self.robots[j]
+            robot.current_position = (int(self.position[j, 0]), int(self.position[j, 1]))
+            # hide the reserve from the planner so robots finish tasks with enough charge to reach a station
+            robot.battery_level = int(max(self.battery[j] - self.battery_reserve, 0))
+            robot.is_carrying_box = False
+            robots.append(robot)
+        return robots
+
+    def _move(self, j: int, destination: tuple):
+        old_r, old_c = int(self.position[j, 0]), int(self.position[j, 1])
+        if self.grid.get_cell(old_r, old_c) == CellType.ROBOT:
+            self.grid.set_cell(old_r, old_c, CellType.EMPTY)
+        self.position[j] = destination
+        if self.grid.get_cell(destination[0], destination[1]) == CellType.EMPTY:
+            self.grid.set_cell(destination[0], destination[1], CellType.ROBOT)
+
+    def _recharge(self):
+        """Send idle robots below `recharge_below` to their nearest charging station."""
+        if self.recharge_below is None or len(self.stations) == 0:
+            return
+        low = np.flatnonzero(self._idle_mask() & (self.battery < self.recharge_below))
+        if len(low) == 0:
+            return
+        distance = _manhattan(self.position[low], self.stations)
+        nearest = distance.argmin(axis=1)
+        cells = distance[np.arange(len(low)), nearest]
+        # robots that cannot make it to any station stay stranded
+        reachable = cells + 1 <= self.battery[low]
+        low, nearest, cells = low[reachable], nearest[reachable], cells[reachable]
+
+        duration = cells * self.seconds_per_cell + self.charge_seconds
+        self.battery_used[low] += cells + 1
+        self.battery[low] = 100
+        self.charges[low] += 1
+        self.busy_until[low] = self.time + duration
+        self.busy_seconds[low] += duration
+        for j, station in zip(low.tolist(), self.stations[nearest].tolist()):
+            self._move(j, tuple(station))
+
+    def _travel_cells(self, info: Dict) -> int:
+        if info.get('travel_cells') is not None:
+            return info['travel_cells']
+        paths = [info.get('path_to_charge'), info.get('path_to_pickup'), info.get('path_to_dropoff')]
+        return sum(len(path) - 1 for path in paths if path)
+
+    def _apply(self, schedule: Dict, pending: List[Tuple[float, Task]]) -> set:
+        tasks = {task.task_id: (arrival, task) for arrival, task in pending}
+        dispatched = set()
+        for task_id, info in schedule.items():
+            if task_id not in tasks:
+                continue
+            j = self.robot_index[info['robot_id']]
+            arrival, task = tasks[task_id]
+            charged = bool(info.get('path_to_charge') or info.get('charge_station'))
+
+            duration = self._travel_cells(info) * self.seconds_per_cell
+            if charged:
+                # the trip to the station drains the battery before it is topped up
+                if info.get('path_to_charge'):
+                    self.battery_used[j] += len(info['path_to_charge'])
+                else:
+                    station = info['charge_station']
+                    self.battery_used[j] += abs(int(self.position[j, 0]) - station[0]) + abs(int(self.position[j, 1]) - station[1]) + 1
+                duration += self.charge_seconds
+                self.battery[j] = 100
+                self.charges[j] += 1
+            cost = info['estimated_battery_cost']
+            self.battery[j] -= cost
+            self.battery_used[j] += cost
+
+            self._move(j, task.dropoff_location)
+
+            self.busy_until[j] = self.time + duration
+            self.busy_seconds[j] += duration
+            self.completions.append((arrival, self.time, self.time + duration))
+            dispatched.add(task_id)
+
+            if self.on_dispatch:
+                self.on_dispatch(self.time, {'task_id': task_id, **info})
+        return dispatched
+
+    def _dispatch(self):
+        idle = np.flatnonzero(self._idle_mask())
+        if len(idle) == 0 or not self.pending:
+            return
+        robots = self._sync_robots(idle)
+        schedule = self.reschedule(self.grid, robots, [task for _, task in self.pending],
+                                   battery_reserve=self.battery_reserve)
+        self.reschedule_calls += 1
+        dispatched = self._apply(schedule, self.pending)
+        self.pending = [(arrival, task) for arrival, task in self.pending if task.task_id not in dispatched]
+
+    def run(self, duration: float) -> Dict:
+        """Advance the simulation by `duration` seconds and return statistics."""
+        end = self.time + duration
+        last_reschedule = -np.inf
+
+        while True:
+            while self.arrivals and self.arrivals[0][0] <= self.time:
+                arrival_time, _, task = heapq.heappop(self.arrivals)
+                self.pending.append((arrival_time, task))
+
+            self._recharge()
+            if self.pending and self.time >= last_reschedule + self.reschedule_interval:
+                self._dispatch()
+                last_reschedule = self.time
+
+            if self.time >= end:
+                break
+
+            # wake on the next arrival or robot becoming idle, but no more often than the reschedule interval
+            next_time = end
+            if self.arrivals:
+                next_time = min(next_time, self.arrivals[0][0])
+            busy = self.busy_until[self.busy_until > self.time]
+            if len(busy):
+                next_time = min(next_time, busy.min())
+            next_time = max(next_time, last_reschedule + self.reschedule_interval)
+            self.time = min(next_time, end)
+
+        return self.statistics()
+
+    def statistics(self) -> Dict:
+        elapsed = max(self.time, 1e-9)
+        done = np.array(self.completions, dtype=np.float64).reshape(-1, 3)
+        finished = done[done[:, 2] <= self.time]
+        latency = finished[:, 2] - finished[:, 0]
+        wait = done[:, 1] - done[:, 0]
+        # only count the part of each robot's work that falls inside the simulated window
+        overrun = np.clip(self.busy_until - self.time, 0, None)
+        utilisation = (self.busy_seconds - overrun) / elapsed
+
+        def percentiles(values: np.ndarray) -> Dict:
+            if len(values) == 0:
+                return {"mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95),
+                    "p99": float(p99), "max": float(values.max())}
+
+        return {
+            "simulated_seconds": float(self.time),
+            "tasks_completed": int(len(finished)),
+            "tasks_in_progress": int(len(done) - len(finished)),
+            "tasks_pending": len(self.pending),
+            "throughput_per_hour": float(len(finished) * SECONDS_PER_HOUR / elapsed),
+            "latency_seconds": percentiles(latency),
+            "wait_seconds": percentiles(wait),
+            "robot_utilisation": {
+                "mean": float(utilisation.mean()) if len(utilisation) else 0.0,
+                "min": float(utilisation.min()) if len(utilisation) else 0.0,
+                "max": float(utilisation.max()) if len(utilisation) else 0.0
+            },
+            "battery": {
+                "total_used": float(self.battery_used.sum()),
+                "mean_level": float(self.battery.mean()) if len(self.battery) else 0.0,
+                "min_level": float(self.battery.min()) if len(self.battery) else 0.0,
+                "charges": int(self.charges.sum())
+            },
+            "reschedule_calls": self.reschedule_calls
+        }
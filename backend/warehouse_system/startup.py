@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+from warehouse_system import schedule
+from warehouse_system.warehouse import Warehouse
+from warehouse_system.grid import Grid
+from warehouse_system.robot import Robot
+from warehouse_system.task import Task
+from warehouse_system.enums import RobotType, Shift, TaskType
+
+
+def measure_import_times(module: str = "main", cwd: Optional[str] = None, top: Optional[int] = None) -> Dict[str, float]:
+    """Cumulative import time in seconds per module, from a fresh `python -X importtime` run."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else f"Cannot import {module}")
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    ranked = sorted(times.items(), key=lambda item: item[1], reverse=True)
+    return dict(ranked[:top] if top else ranked)
+
+
+def _sample_warehouse() -> dict:
+    grid = Grid(5, 5)
+    warehouse = Warehouse(grid, [], [])
+    warehouse.add_robot(Robot('warmup', RobotType.GENERAL, Shift.DAY, current_position=(0, 0)))
+    warehouse.add_task(Task('warmup', TaskType.STANDARD, Shift.DAY, (1, 1), (3, 3)))
+    return warehouse.serialize()
+
+
+def warm_up() -> Dict:
+    """Preload the solver before taking traffic.
+
+    Imports OR-Tools and runs one trivial solve so CP-SAT's native setup is
+    paid here rather than by the first request. Nothing else is kept: path
+    searches are per request and are not preloaded.
+    """
+    start = time.perf_counter()
+    schedule.load_cp_model()
+    solver_load_seconds = schedule.solver_load_seconds
+    Warehouse.deserialize(_sample_warehouse()).get_scheduler().serialize()
+    return {
+        "solver_load_seconds": solver_load_seconds,
+        "first_solve_seconds": time.perf_counter() - start - solver_load_seconds,
+        "total_seconds": time.perf_counter() - start
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure_import_times("main", top=25), indent=2))
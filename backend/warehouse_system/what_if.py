@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from warehouse_system.grid import Grid
+from warehouse_system.path_finder import PathFinder, base_costs
+from warehouse_system.warehouse import Warehouse
+from warehouse_system.enums import CellType
+
+# per-process copy of the base layout, set once by _init_worker
+_base = None
+
+
+def _tile_cost(cell_type: CellType) -> float:
+    return base_costs.get(cell_type, float('inf'))
+
+
+def _leg_cost(grid: Grid, path: list, carrying: bool) -> float:
+    """Tile cost A* assigned to a leg, ignoring the goal cell which every alternative shares."""
+    cost = sum(_tile_cost(grid.get_cell(r, c)) for r, c in path[1:-1])
+    return cost * 2 if carrying else cost
+
+
+def _manhattan(a: tuple, b: tuple) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _leg_affected(path: list, leg_cost: float, carrying: bool, position: tuple, old: CellType, new: CellType) -> bool:
+    if position in path:
+        return True
+    # a cheaper cell can only shorten the leg if a path through it could beat the current one
+    if _tile_cost(new) < _tile_cost(old):
+        lower_bound = (_manhattan(path[0], position) + _manhattan(position, path[-1])) * (2 if carrying else 1)
+        return lower_bound <= leg_cost
+    return False
+
+
+def _pair_affected(pair: dict, changes: list) -> bool:
+    for position, old, new in changes:
+        if _leg_affected(pair['path_to_pickup'], pair['pickup_cost'], False, position, old, new):
+            return True
+        if _leg_affected(pair['path_to_dropoff'], pair['dropoff_cost'], True, position, old, new):
+            return True
+    return False
+
+
+def precompute_base(warehouse: Warehouse) -> Dict:
+    """Pair costs of the base layout keyed by (task_id, robot_id).
+
+    Only pairs that can go direct (no charging detour) are kept: their paths
+    tell exactly which edits can change them. Everything else is cheap to
+    recompute and depends on the charging stations anyway.
+    """
+    scheduler = warehouse.get_scheduler()
+    pair_costs = scheduler.compute_pair_costs()
+    reusable = {}
+    for (i, j), pair in pair_costs.items():
+        if pair is None or pair['path_to_charge'] is not None:
+            continue
+        reusable[(scheduler.tasks[i].task_id, scheduler.robots[j].robot_id)] = {
+            **pair,
+            'pickup_cost': _leg_cost(scheduler.grid, pair['path_to_pickup'], False),
+            'dropoff_cost': _leg_cost(scheduler.grid, pair['path_to_dropoff'], True)
+        }
+    return {"pairs": reusable, "schedule": scheduler.solve(pair_costs), "num_pairs": len(pair_costs)}
+
+
+def apply_edits(warehouse: Warehouse, edits: List[dict]) -> list:
+    """Apply cell edits the way /api/cell does and return (position, old, new) changes."""
+    changes = []
+    for edit in edits:
+        row, col = edit["position"]
+        if row < 0 or row >= warehouse.grid.height or col < 0 or col >= warehouse.grid.width:
+            raise ValueError(f"Invalid position: {edit['position']}")
+        if edit["cell_type"] == CellType.ROBOT.value or not CellType.is_valid(edit["cell_type"]):
+            raise ValueError(f"Invalid cell type: {edit['cell_type']}")
+
+        old = warehouse.grid.get_cell(row, col)
+        if old == CellType.ROBOT:
+            warehouse.remove_robot_at(row, col)
+        new = CellType(edit["cell_type"])
+        warehouse.grid.set_cell(row, col, new)
+        changes.append(((row, col), old, new))
+    return changes
+
+
+def schedule_metrics(schedule: Dict, num_tasks: int) -> Dict:
+    costs = [info['estimated_battery_cost'] for info in schedule.values()]
+    return {
+        "tasks_assigned": len(schedule),
+        "tasks_unassigned": num_tasks - len(schedule),
+        "total_battery_cost": sum(costs),
+        "mean_battery_cost": sum(costs) / len(costs) if costs else None,
+        "charging_trips": sum(1 for info in schedule.values() if info['path_to_charge'])
+    }
+
+
+def evaluate_variant(base_data: dict, base: Dict, variant: dict) -> Dict:
+    """Schedule one variant, reusing base pair costs its edits cannot have changed."""
+    result = {"name": variant.get("name"), "edits": variant.get("edits", [])}
+    try:
+        warehouse = Warehouse.deserialize(base_data)
+        changes = apply_edits(warehouse, variant.get("edits", []))
+    except Exception as e:
+        return {**result, "error": str(e)}
+
+    scheduler = warehouse.get_scheduler()
+    pathfinder = PathFinder(scheduler.grid)
+    stations_changed = any(CellType.CHARGING_STATION in (old, new) for _, old, new in changes)
+    charging_stations = scheduler.grid.find_charging_stations()
+
+    pair_costs = {}
+    reused = 0
+    for i, task in enumerate(scheduler.tasks):
+        for j, robot in enumerate(scheduler.robots):
+            if not (scheduler.is_type_compatible(robot.robot_type, task.type) and scheduler.is_shift_compatible(robot.shift, task.shift)):
+                continue
+            pair = base["pairs"].get((task.task_id, robot.robot_id))
+            if pair is not None and not _pair_affected(pair, changes):
+                pair_costs[(i, j)] = pair
+                reused += 1
+            else:
+                pair_costs[(i, j)] = scheduler.compute_pair_cost(pathfinder, task, robot, charging_stations)
+
+    schedule = scheduler.solve(pair_costs)
+    return {
+        **result,
+        **schedule_metrics(schedule, len(scheduler.tasks)),
+        "pairs_reused": reused,
+        "pairs_recomputed": len(pair_costs) - reused,
+        "charging_stations_changed": stations_changed,
+        "schedule": schedule
+    }
+
+
+def _init_worker(base_data: dict, base: Dict):
+    global _base
+    _base = (base_data, base)
+
+
+def _evaluate_in_worker(variant: dict) -> Dict:
+    return evaluate_variant(_base[0], _base[1], variant)
+
+
+def rank_variants(results: List[Dict]) -> List[Dict]:
+    """Most tasks assigned first, then lowest total battery cost; failed variants last."""
+    def key(result):
+        if "error" in result:
+            return (1, 0, 0)
+        return (0, -result["tasks_assigned"], result["total_battery_cost"])
+
+    ranked = sorted(results, key=key)
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+    return ranked
+
+
+def evaluate_layout_changes(base_data: dict, variants: List[dict], max_workers: Optional[int] = None) -> Dict:
+    """Evaluate candidate layout edits against a base warehouse.
+
+    `variants` is a list of {"name": ..., "edits": [{"position": [r, c], "cell_type": ...}]}.
+    Returns the base metrics and the variants ranked best first, each with its
+    metrics and the change against the base.
+    """
+    warehouse = Warehouse.deserialize(base_data)
+    base_data = warehouse.serialize()
+    base = precompute_base(warehouse)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(variants))
+    if max_workers <= 1:
+        results = [evaluate_variant(base_data, base, variant) for variant in variants]
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(base_data, base)) as executor:
+            results = list(executor.map(_evaluate_in_worker, variants))
+
+    base_metrics = schedule_metrics(base["schedule"], len(base_data["tasks"]))
+    for result in results:
+        if "error" not in result:
+            result["delta_tasks_assigned"] = result["tasks_assigned"] - base_metrics["tasks_assigned"]
+            result["delta_battery_cost"] = result["total_battery_cost"] - base_metrics["total_battery_cost"]
+
+    return {
+        "base": {**base_metrics, "pairs": base["num_pairs"], "schedule": base["schedule"]},
+        "variants": rank_variants(results)
+    }
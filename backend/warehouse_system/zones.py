@@ -0,0 +1,393 @@
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+from warehouse_system.grid import Grid
+from warehouse_system.robot import Robot
+from warehouse_system.task import Task
+from warehouse_system.warehouse import Warehouse
+from warehouse_system.schedule import load_cp_model
+from warehouse_system.enums import CellType
+
+# cells a handoff point may sit on: free floor on both sides of the border
+handoff_cell_types = [CellType.EMPTY, CellType.RAMP, CellType.SLOPE, CellType.CHARGING_STATION]
+
+# zone schedules each worker keeps, keyed by a digest of the zone's contents
+zone_cache_size = 64
+
+
+class Zone:
+    def __init__(self, zone_id: int, row0: int, col0: int, row1: int, col1: int):
+        self.zone_id = zone_id
+        self.row0 = row0
+        self.col0 = col0
+        self.row1 = row1
+        self.col1 = col1
+
+    @property
+    def width(self) -> int:
+        return self.col1 - self.col0
+
+    @property
+    def height(self) -> int:
+        return self.row1 - self.row0
+
+    def contains(self, position: tuple) -> bool:
+        return self.row0 <= position[0] < self.row1 and self.col0 <= position[1] < self.col1
+
+    def to_local(self, position: tuple) -> tuple:
+        return (position[0] - self.row0, position[1] - self.col0)
+
+    def to_global(self, position: tuple) -> tuple:
+        return (position[0] + self.row0, position[1] + self.col0)
+
+    def subgrid(self, grid: Grid) -> Grid:
+        sub = Grid(self.width, self.height)
+        for r in range(self.height):
+            for c in range(self.width):
+                sub.set_cell(r, c, grid.get_cell(r + self.row0, c + self.col0))
+        return sub
+
+    def __repr__(self):
+        return f"Zone(id={self.zone_id}, rows={self.row0}:{self.row1}, cols={self.col0}:{self.col1})"
+
+
+def partition_grid(grid: Grid, zone_rows: int, zone_cols: int) -> List[Zone]:
+    """Split the grid into a zone_rows x zone_cols block layout, row-major zone ids."""
+    zone_rows = max(1, min(zone_rows, grid.height))
+    zone_cols = max(1, min(zone_cols, grid.width))
+    row_edges = [grid.height * i // zone_rows for i in range(zone_rows + 1)]
+    col_edges = [grid.width * j // zone_cols for j in range(zone_cols + 1)]
+    return [
+        Zone(i * zone_cols + j, row_edges[i], col_edges[j], row_edges[i + 1], col_edges[j + 1])
+        for i in range(zone_rows)
+        for j in range(zone_cols)
+    ]
+
+
+def find_handoffs(grid: Grid, zones: List[Zone]) -> Dict[Tuple[int, int], Tuple[tuple, tuple]]:
+    """Pick one handoff point per pair of bordering zones.
+
+    Maps (from_zone, to_zone) to (exit cell in from_zone, entry cell in to_zone).
+    The pair closest to the middle of the shared border is used.
+    """
+    handoffs = {}
+    for a in zones:
+        for b in zones:
+            if a.zone_id == b.zone_id:
+                continue
+            candidates = []
+            if a.row1 == b.row0 or b.row1 == a.row0:
+                row_a, row_b = (a.row1 - 1, b.row0) if a.row1 == b.row0 else (a.row0, b.row1 - 1)
+                lo, hi = max(a.col0, b.col0), min(a.col1, b.col1)
+                candidates = [((row_a, c), (row_b, c)) for c in range(lo, hi)]
+            elif a.col1 == b.col0 or b.col1 == a.col0:
+                col_a, col_b = (a.col1 - 1, b.col0) if a.col1 == b.col0 else (a.col0, b.col1 - 1)
+                lo, hi = max(a.row0, b.row0), min(a.row1, b.row1)
+                candidates = [((r, col_a), (r, col_b)) for r in range(lo, hi)]
+
+            candidates = [
+                (exit_cell, entry_cell) for exit_cell, entry_cell in candidates
+                if grid.get_cell(*exit_cell) in handoff_cell_types and grid.get_cell(*entry_cell) in handoff_cell_types
+            ]
+            if candidates:
+                middle = (lo + hi - 1) / 2
+                axis = 1 if a.row1 == b.row0 or b.row1 == a.row0 else 0
+                handoffs[(a.zone_id, b.zone_id)] = min(candidates, key=lambda pair: abs(pair[0][axis] - middle))
+    return handoffs
+
+
+def route_zones(start: int, goal: int, handoffs: Dict[Tuple[int, int], Tuple[tuple, tuple]]) -> Optional[List[int]]:
+    """Shortest chain of zones from start to goal through available handoff points."""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        zone_id = queue.popleft()
+        if zone_id == goal:
+            route = []
+            while zone_id is not None:
+                route.append(zone_id)
+                zone_id = parent[zone_id]
+            return list(reversed(route))
+        for (a, b) in handoffs:
+            if a == zone_id and b not in parent:
+                parent[b] = zone_id
+                queue.append(b)
+    return None
+
+
+def zone_digest(zone_data: dict) -> str:
+    """Stable id for a zone's grid, robots and tasks, shared by every request with the same layout."""
+    return hashlib.sha1(json.dumps(zone_data, sort_keys=True).encode()).hexdigest()
+
+
+def _zone_worker(conn):
+    # zone digest -> schedule in zone-local coordinates, least recently used first
+    schedules: OrderedDict = OrderedDict()
+
+    while True:
+        try:
+            command, key, payload = conn.recv()
+        except EOFError:
+            break
+        try:
+            result = None
+            if command == "stop":
+                conn.send(("ok", None))
+                break
+            elif command == "warmup":
+                load_cp_model()
+            elif command == "schedule":
+                if key in schedules:
+                    schedules.move_to_end(key)
+                else:
+                    schedules[key] = Warehouse.deserialize(payload).get_scheduler().serialize()
+                    if len(schedules) > zone_cache_size:
+                        schedules.popitem(last=False)
+                result = schedules[key]
+            else:
+                raise ValueError(f"Unknown zone command: {command}")
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class ZonePool:
+    """Long-lived worker processes that own warehouse zones."""
+
+    def __init__(self, num_workers: Optional[int] = None, start_method: Optional[str] = None):
+        context = multiprocessing.get_context(start_method)
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.workers = []
+        for _ in range(self.num_workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_zone_worker, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn, threading.Lock()))
+
+    def call_many(self, calls: List[Tuple[int, str, Optional[str], object]]) -> list:
+        """Send (worker, command, key, payload) calls, running the workers in parallel."""
+        involved = sorted({worker for worker, _, _, _ in calls})
+        # always lock in worker order so concurrent requests cannot deadlock
+        for worker in involved:
+            self.workers[worker][2].acquire()
+        try:
+            for worker, command, key, payload in calls:
+                self.workers[worker][1].send((command, key, payload))
+            replies = [self.workers[worker][1].recv() for worker, _, _, _ in calls]
+        finally:
+            for worker in involved:
+                self.workers[worker][2].release()
+
+        for status, result in replies:
+            if status == "error":
+                raise RuntimeError(result)
+        return [result for _, result in replies]
+
+    def warm_up(self):
+        """Load the solver in every worker before it receives zones."""
+        self.call_many([(worker, "warmup", None, None) for worker in range(self.num_workers)])
+
+    def close(self):
+        for process, conn, lock in self.workers:
+            with lock:
+                try:
+                    conn.send(("stop", None, None))
+                    conn.recv()
+                except (EOFError, OSError, BrokenPipeError):
+                    pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+
+
+class ZonedWarehouse:
+    """Warehouse split into zones owned by ZonePool workers.
+
+    Exposes the same interface as Warehouse, so callers can swap it in. Each
+    zone is sent to its worker as a self-contained warehouse; workers cache
+    schedules by zone contents, so unchanged zones are not re-solved on later
+    requests, even from other ZonedWarehouse instances.
+
+    Tasks whose pickup and dropoff sit in different zones are split into legs.
+    A leg that leaves its zone ends at the handoff's exit cell; the box then
+    crosses the border to the entry cell in the next zone as an explicit
+    transfer step (a pass-through shelf or conveyor), where the next leg picks
+    it up. No robot drives the transfer.
+    """
+
+    def __init__(self, grid: Grid, robots: Optional[List[Robot]] = None, tasks: Optional[List[Task]] = None,
+                 pool: Optional[ZonePool] = None, zone_rows: int = 2, zone_cols: int = 2):
+        self.grid = grid
+        self.__robots = list(robots or [])
+        self.__tasks = list(tasks or [])
+        self.__owns_pool = pool is None
+        self.pool = pool or ZonePool()
+        self.zones = partition_grid(self.grid, zone_rows, zone_cols)
+
+    @classmethod
+    def deserialize(cls, data: dict, pool: Optional[ZonePool] = None, zone_rows: int = 2, zone_cols: int = 2):
+        warehouse = Warehouse.deserialize(data)
+        serialized = warehouse.serialize()
+        return cls(
+            Grid.deserialize(serialized["grid"]),
+            list(map(Robot.deserialize, serialized["robots"])),
+            list(map(Task.deserialize, serialized["tasks"])),
+            pool,
+            zone_rows,
+            zone_cols
+        )
+
+    def __worker(self, zone: Zone) -> int:
+        return zone.zone_id % self.pool.num_workers
+
+    def zone_of(self, position: tuple) -> Optional[Zone]:
+        for zone in self.zones:
+            if zone.contains(position):
+                return zone
+        return None
+
+    def __local_robot(self, zone: Zone, robot: Robot) -> dict:
+        data = robot.serialize()
+        data["current_position"] = list(zone.to_local(robot.current_position))
+        return data
+
+    def __local_task(self, zone: Zone, task_id: str, task: Task, pickup: tuple, dropoff: tuple) -> dict:
+        data = task.serialize()
+        data["task_id"] = task_id
+        data["pickup_location"] = list(zone.to_local(pickup))
+        data["dropoff_location"] = list(zone.to_local(dropoff))
+        return data
+
+    def __split_tasks(self, dropped: frozenset = frozenset()) -> Tuple[Dict[int, List[dict]], Dict[str, List[dict]]]:
+        """Assign each task (or each leg of a cross-zone task) to a zone, leaving out `dropped` task ids."""
+        handoffs = find_handoffs(self.grid, self.zones)
+        zone_tasks = {zone.zone_id: [] for zone in self.zones}
+        legs = {}
+        for task in self.__tasks:
+            if task.task_id in dropped:
+                continue
+            start = self.zone_of(task.pickup_location)
+            goal = self.zone_of(task.dropoff_location)
+            # off-floor tasks are unschedulable, as they are for a plain Warehouse
+            if start is None or goal is None:
+                continue
+            if start.zone_id == goal.zone_id:
+                zone_tasks[start.zone_id].append(
+                    self.__local_task(start, task.task_id, task, task.pickup_location, task.dropoff_location))
+                continue
+
+            route = route_zones(start.zone_id, goal.zone_id, handoffs)
+            if route is None:
+                continue
+            legs[task.task_id] = []
+            pickup = task.pickup_location
+            for k, zone_id in enumerate(route):
+                zone = self.zones[zone_id]
+                if k + 1 < len(route):
+                    dropoff, next_pickup = handoffs[(zone_id, route[k + 1])]
+                else:
+                    dropoff, next_pickup = task.dropoff_location, None
+                leg_id = f"{task.task_id}:{k}"
+                zone_tasks[zone_id].append(self.__local_task(zone, leg_id, task, pickup, dropoff))
+                handoff = {"exit": list(dropoff), "entry": list(next_pickup)} if next_pickup else None
+                legs[task.task_id].append({"leg_id": leg_id, "zone": zone_id, "handoff": handoff})
+                pickup = next_pickup
+        return zone_tasks, legs
+
+    def __zone_data(self, zone: Zone, tasks: List[dict]) -> dict:
+        return {
+            "grid": zone.subgrid(self.grid).serialize(),
+            "robots": [self.__local_robot(zone, r) for r in self.__robots if zone.contains(r.current_position)],
+            "tasks": tasks
+        }
+
+    def add_robot(self, robot: Robot):
+        self.__robots.append(robot)
+        self.grid.set_cell(robot.current_position[0], robot.current_position[1], CellType.ROBOT)
+
+    def add_task(self, task: Task):
+        self.__tasks.append(task)
+        self.grid.set_cell(task.pickup_location[0], task.pickup_location[1], CellType.BOX)
+
+    def remove_robot_by_id(self, robot_id: str):
+        for i, r in enumerate(self.__robots):
+            if r.robot_id == robot_id:
+                self.__robots.pop(i)
+                self.grid.set_cell(r.current_position[0], r.current_position[1], CellType.EMPTY)
+                break
+
+    def remove_robot_at(self, row: int, col: int):
+        for r in self.__robots:
+            if r.current_position[0] == row and r.current_position[1] == col:
+                self.remove_robot_by_id(r.robot_id)
+                break
+
+    def serialize(self):
+        return {
+            "grid": self.grid.serialize(),
+            "robots": list(map(Robot.serialize, self.__robots)),
+            "tasks": list(map(Task.serialize, self.__tasks))
+        }
+
+    def __solve_zones(self, zone_tasks: Dict[int, List[dict]]) -> dict:
+        calls = []
+        for zone in self.zones:
+            zone_data = self.__zone_data(zone, zone_tasks[zone.zone_id])
+            calls.append((self.__worker(zone), "schedule", zone_digest(zone_data), zone_data))
+        results = self.pool.call_many(calls)
+
+        merged = {}
+        for zone, schedule in zip(self.zones, results):
+            for task_id, info in schedule.items():
+                info = dict(info)
+                for path_key in ["path_to_pickup", "path_to_dropoff", "path_to_charge"]:
+                    if info[path_key]:
+                        info[path_key] = [zone.to_global(tuple(p)) for p in info[path_key]]
+                merged[task_id] = info
+        return merged
+
+    def compute_schedule(self) -> dict:
+        # a cross-zone task only counts if every leg got a robot; drop incomplete ones and
+        # re-solve so the robots they held can take other work (unchanged zones hit the cache)
+        dropped = frozenset()
+        while True:
+            zone_tasks, legs = self.__split_tasks(dropped)
+            merged = self.__solve_zones(zone_tasks)
+            incomplete = {
+                task_id for task_id, task_legs in legs.items()
+                if not all(leg["leg_id"] in merged for leg in task_legs)
+            }
+            if not incomplete:
+                break
+            dropped |= incomplete
+
+        for task_id, task_legs in legs.items():
+            for k, leg in enumerate(task_legs):
+                merged[leg["leg_id"]].update({"task_id": task_id, "leg": k, "zone": leg["zone"], "handoff": leg["handoff"]})
+        return merged
+
+    def get_scheduler(self):
+        return ZonedScheduler(self)
+
+    def close(self):
+        if self.__owns_pool:
+            self.pool.close()
+
+
+class ZonedScheduler:
+    """Scheduler facade over a ZonedWarehouse, matching Scheduler.serialize()."""
+
+    def __init__(self, warehouse: ZonedWarehouse):
+        self.warehouse = warehouse
+
+    def compute_global_optimal_schedule(self):
+        return self.warehouse.compute_schedule()
+
+    def serialize(self):
+        return self.compute_global_optimal_schedule()